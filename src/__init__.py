@@ -1,9 +1,16 @@
 # 統計処理アプリケーション
 # バージョン1.0.0
 
-from .analyzer import StatisticalAnalyzer
 from .validator import DataValidator
 from .ui_manager import UIManager
 
 __version__ = "1.0.0"
-__all__ = ["StatisticalAnalyzer", "DataValidator", "UIManager"]
\ No newline at end of file
+__all__ = ["StatisticalAnalyzer", "DataValidator", "UIManager"]
+
+
+def __getattr__(name):
+    # sympy/scipyの読み込みを起動時に行わないよう、StatisticalAnalyzerは遅延importする
+    if name == "StatisticalAnalyzer":
+        from .analyzer import StatisticalAnalyzer
+        return StatisticalAnalyzer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
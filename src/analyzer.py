@@ -1,71 +1,167 @@
-from typing import List, Tuple, Dict
+from functools import lru_cache
+from typing import List, Tuple, Dict, Union
 import numpy as np
 from scipy import stats
-from sympy import diff, symbols, sympify
+from sympy import Expr, Matrix, S, Symbol, diff, lambdify, symbols, sympify
+from sympy.parsing.sympy_parser import convert_xor, parse_expr, standard_transformations
+
+try:
+    import symengine
+except ImportError:  # symengineが無い環境ではsympyで微分する
+    symengine = None
+
+try:
+    from sympy.simplify._cse_diff import _forward_jacobian
+except ImportError:  # sympy 1.14未満では通常のヤコビアン計算を使う
+    _forward_jacobian = None
+
+# Dixonのq検定の棄却限界値（95%信頼水準, データ数nで添字付け, n < 3 は未定義）
+_Q_CRIT = (None, None, None, 0.970, 0.829, 0.710, 0.625, 0.568, 0.526, 0.493, 0.466)
+
+
+def _as_python(results: Dict[str, any]) -> Dict[str, any]:
+    """結果の辞書に含まれるNumPyスカラーをまとめてPythonの組み込み型に変換する"""
+    return {key: (value.item() if hasattr(value, "item") else value) for key, value in results.items()}
+
+
+@lru_cache(maxsize=1024)
+def _sym(name: str) -> Symbol:
+    """変数名に対応するsympy記号をキャッシュする"""
+    return symbols(name)
+
+
+@lru_cache(maxsize=256)
+def _cached_sympify(function_str: str, var_names: Tuple[str, ...]) -> Expr:
+    """関数の文字列をパースした結果をキャッシュする
+
+    変数名は事前に記号として渡すため、EやIなどの変数名も定数ではなく変数として扱われる
+    """
+    local_dict = {var: _sym(var) for var in var_names}
+    return parse_expr(function_str, local_dict=local_dict,
+                      transformations=standard_transformations + (convert_xor,))
+
+
+@lru_cache(maxsize=256)
+def _cached_partial(function_str: str, var_names: Tuple[str, ...], var_name: str) -> Expr:
+    """(関数, 変数) ごとの偏微分をキャッシュする"""
+    if symengine is not None:
+        # C++実装のsymengineで微分し、表示・数値化のためにsympyの式に戻す
+        # パース済みのsympy式を変換し、変数名の解釈をsympy側と揃える
+        func = symengine.sympify(_cached_sympify(function_str, var_names))
+        partial = symengine.diff(func, symengine.Symbol(var_name))
+        return sympify(partial)
+    return diff(_cached_sympify(function_str, var_names), _sym(var_name))
+
+
+@lru_cache(maxsize=256)
+def _cached_gradient(function_str: str, var_names: Tuple[str, ...]) -> Tuple[Expr, ...]:
+    """各変数についての偏微分をまとめて返す"""
+    func = _cached_sympify(function_str, var_names)
+    free = func.free_symbols
+    # 関数に含まれない変数の偏微分は0なので微分を省略する
+    present = [var for var in var_names if _sym(var) in free]
+    partials = dict.fromkeys(var_names, S.Zero)
+
+    if symengine is None and present:
+        # 共通部分式を共有しながら勾配を一度に計算する
+        wrt = [_sym(var) for var in present]
+        try:
+            if _forward_jacobian is not None:
+                row = _forward_jacobian(Matrix([func]), wrt)
+            else:
+                row = Matrix([func]).jacobian(wrt)
+        except NotImplementedError:
+            # 一括計算に対応しない式（PrintMethodNotImplementedErrorなど）は変数ごとの微分にフォールバック
+            pass
+        else:
+            partials.update(zip(present, row))
+            return tuple(partials[var] for var in var_names)
+
+    for var in present:
+        partials[var] = _cached_partial(function_str, var_names, var)
+    return tuple(partials[var] for var in var_names)
+
+
+@lru_cache(maxsize=256)
+def _cached_numeric(function_str: str, var_names: Tuple[str, ...]):
+    """関数と勾配をNumPyで評価できる関数に変換する"""
+    symbol_list = [_sym(var) for var in var_names]
+    f_num = lambdify(symbol_list, _cached_sympify(function_str, var_names), ['scipy', 'numpy'])
+    grad_num = lambdify(symbol_list, Matrix([_cached_gradient(function_str, var_names)]), ['scipy', 'numpy'])
+    return f_num, grad_num
+
 
 class StatisticalAnalyzer:
     @staticmethod
-    def perform_qtest(data: List[float], confidence_level: float = 0.95) -> Dict[str, float]:
+    def perform_qtest(data: Union[List[float], np.ndarray], confidence_level: float = 0.95) -> Dict[str, float]:
         """Dixonのq検定（外れ値検定）を実行する
 
         Args:
-            data (List[float]): 検定するデータ
+            data (Union[List[float], np.ndarray]): 検定するデータ
+                2次元配列 (N, m) の場合は各行を独立したデータセットとして一括で検定する
             confidence_level (float, optional): 信頼水準. デフォルトは0.95
 
         Returns:
-            Dict[str, float]: Q検定の結果
+            Dict[str, float]: Q検定の結果（2次元入力の場合は各値が行ごとの配列）
             - q_statistic: Q統計量
             - q_critical: 棄却限界値
             - is_outlier: 外れ値の有無（1: 外れ値あり, 0: 外れ値なし）
         """
-        # データを昇順にソート
-        sorted_data = sorted(data)
-        n = len(sorted_data)
+        arr = np.asarray(data, dtype=np.float64)
+        n = arr.shape[-1]
+
+        # 両端の2値だけが必要なので全体をソートせずに部分選択する
+        part = np.partition(arr, (1, n - 2), axis=-1)
+        a, b, c, d = part[..., 0], part[..., 1], part[..., -2], part[..., -1]
 
-        # Q統計量の計算
-        # n > 3の場合のQ統計量
-        q_stat = abs(sorted_data[1] - sorted_data[0]) / abs(sorted_data[-1] - sorted_data[0])
-        q_stat_end = abs(sorted_data[-1] - sorted_data[-2]) / abs(sorted_data[-1] - sorted_data[0])
-        # 大きい方のQ統計量を採用
-        q_stat = max(q_stat, q_stat_end)
-
-        # 棄却限界値の取得（95%信頼水準の場合の値）
-        q_critical_values = {
-            3: 0.970, 4: 0.829, 5: 0.710, 6: 0.625,
-            7: 0.568, 8: 0.526, 9: 0.493, 10: 0.466
-        }
-        
         # データ数に応じた棄却限界値を取得（データ数が10より大きい場合は10のものを使用）
-        q_critical = q_critical_values.get(min(n, 10))
+        q_critical = _Q_CRIT[min(n, 10)]
+
+        # 全データが同じ値の場合は外れ値なしとし、0除算を避ける
+        rng = d - a
+        if arr.ndim == 1 and rng == 0.0:
+            return {
+                "q_statistic": 0.0,
+                "q_critical": float(q_critical),
+                "is_outlier": 0
+            }
+
+        # Q統計量の計算
+        # 両端のギャップのうち大きい方を範囲で割る（範囲が0の行は分子も0なのでQ=0）
+        q_stat = np.maximum(b - a, d - c) / np.where(rng == 0.0, 1.0, rng)
 
         # 外れ値の判定
-        is_outlier = 1 if q_stat > q_critical else 0
+        is_outlier = (q_stat > q_critical).astype(int)
 
-        return {
-            "q_statistic": float(q_stat),
-            "q_critical": float(q_critical),
+        results = {
+            "q_statistic": q_stat,
+            "q_critical": np.full(q_stat.shape, q_critical),
             "is_outlier": is_outlier
         }
+        return _as_python(results) if arr.ndim == 1 else results
 
     @staticmethod
-    def calculate_confidence_interval(data: List[float], confidence_level: float = 0.683) -> Dict[str, float]:
+    def calculate_confidence_interval(data: Union[List[float], np.ndarray],
+                                      confidence_level: float = 0.683) -> Dict[str, float]:
         """t分布に基づく信頼区間を計算する
 
         Args:
-            data (List[float]): データ
+            data (Union[List[float], np.ndarray]): データ
+                2次元配列 (N, m) の場合は各行を独立したデータセットとして一括で計算する
             confidence_level (float, optional): 信頼水準. デフォルトは0.683
 
         Returns:
-            Dict[str, float]: 信頼区間の計算結果
+            Dict[str, float]: 信頼区間の計算結果（2次元入力の場合は各値が行ごとの配列）
             - mean: 平均値
             - std: 標準偏差
             - lower: 信頼区間下限
             - upper: 信頼区間上限
             - confidence_level: 信頼水準
         """
-        n = len(data)
-        mean = np.mean(data)
-        std = np.std(data, ddof=1)  # 不偏標準偏差
+        arr = np.asarray(data, dtype=np.float64)
+        n = arr.shape[-1]
+        mean = np.mean(arr, axis=-1)
+        std = np.std(arr, ddof=1, axis=-1)  # 不偏標準偏差
         
         # t分布の両側パーセント点を計算
         t_value = stats.t.ppf((1 + confidence_level) / 2, n - 1)
@@ -78,18 +174,19 @@ class StatisticalAnalyzer:
         lower = mean - margin_of_error
         upper = mean + margin_of_error
 
-        return {
-            "mean": float(mean),
-            "std": float(std),
-            "lower": float(lower),
-            "upper": float(upper),
-            "confidence_level": float(confidence_level)
+        results = {
+            "mean": mean,
+            "std": std,
+            "lower": lower,
+            "upper": upper,
+            "confidence_level": confidence_level
         }
+        return _as_python(results) if arr.ndim == 1 else results
 
     @staticmethod
-    def calculate_error_propagation(variables: List[str], values: List[float],
-                                    errors: List[float], function_str: str) -> Dict[str, any]:
-        """誤差伝播法を使用して関数の誤差を計算する
+    def calculate_error_propagation_numeric(variables: List[str], values: List[float],
+                                            errors: List[float], function_str: str) -> Dict[str, float]:
+        """誤差伝播法を使用して関数の誤差を計算する（式の文字列は生成しない）
 
         Args:
             variables (List[str]): 変数名のリスト
@@ -98,46 +195,29 @@ class StatisticalAnalyzer:
             function_str (str): 計算する関数の文字列表現
 
         Returns:
-            Dict[str, any]: 誤差伝播の計算結果
+            Dict[str, float]: 誤差伝播の計算結果
             - function_value: 関数の計算値
             - propagated_error: 伝播した誤差
             - relative_error: 相対誤差（%）
-            - latex_original: 元の関数のLaTeX表現
-            - latex_derivatives: 各変数の偏微分のLaTeX表現のリスト
         """
-        # 変数をsympy記号に変換
-        symbol_list = [symbols(var) for var in variables]
-        
-        # 関数をパース
-        func = sympify(function_str)
-        
-        # 変数と値の辞書を作成
-        var_dict = dict(zip(symbol_list, values))
-        
-        # 関数値を計算
-        function_value = float(func.subs(var_dict))
-        
-        # 元の関数のPython形式を取得
-        func_str = str(func)
-        
-        # 誤差伝播の計算と偏微分のPython形式を格納
-        total = 0
-        derivatives = []
-        for symbol, error in zip(symbol_list, errors):
-            # 偏微分を計算
-            partial_derivative = diff(func, symbol)
-            # 偏微分のPython形式を保存
-            derivatives.append({
-                'variable': str(symbol),
-                'expression': str(partial_derivative)
-            })
-            # 偏微分値を計算
-            derivative_value = float(partial_derivative.subs(var_dict))
-            # 誤差の二乗項を加算
-            total += (derivative_value * error) ** 2
-        
-        # 誤差の平方根を計算
-        propagated_error = total ** 0.5
+        var_names = tuple(variables)
+
+        # 関数値をNumPyで評価
+        # 定義域外の値（負の数の平方根など）は例外ではなくnanになるため、警告は出さずに後で検出する
+        f_num, grad_num = _cached_numeric(function_str, var_names)
+        with np.errstate(all="ignore"):
+            function_value = float(f_num(*values))
+        if not np.isfinite(function_value):
+            raise ValueError("関数値を計算できません。変数の値が関数の定義域内か確認してください。")
+
+        # 誤差の二乗和の平方根を計算
+        err_arr = np.asarray(errors, dtype=np.float64)
+        with np.errstate(all="ignore"):
+            grad = np.asarray(grad_num(*values), dtype=np.float64).ravel()
+            propagated_error = float(np.linalg.norm(grad * err_arr))
+        # 偏微分にnan/infが含まれると二乗和も有限にならない
+        if not np.isfinite(propagated_error):
+            raise ValueError("偏微分を計算できません。変数の値が関数の定義域内か確認してください。")
         
         # 相対誤差を計算（%表示）
         relative_error = (propagated_error / abs(function_value)) * 100 if function_value != 0 else float('inf')
@@ -145,11 +225,44 @@ class StatisticalAnalyzer:
         return {
             "function_value": function_value,
             "propagated_error": propagated_error,
-            "relative_error": relative_error,
-            "original_function": func_str,
-            "derivatives": derivatives
+            "relative_error": relative_error
         }
 
+    @staticmethod
+    def calculate_error_propagation(variables: List[str], values: List[float],
+                                    errors: List[float], function_str: str) -> Dict[str, any]:
+        """誤差伝播法を使用して関数の誤差を計算し、表示用の式も返す
+
+        Args:
+            variables (List[str]): 変数名のリスト
+            values (List[float]): 変数の値のリスト
+            errors (List[float]): 各変数の誤差のリスト
+            function_str (str): 計算する関数の文字列表現
+
+        Returns:
+            Dict[str, any]: 誤差伝播の計算結果
+            - function_value: 関数の計算値
+            - propagated_error: 伝播した誤差
+            - relative_error: 相対誤差（%）
+            - original_function: 元の関数のPython形式
+            - derivatives: 各変数の偏微分のPython形式のリスト
+        """
+        results = StatisticalAnalyzer.calculate_error_propagation_numeric(
+            variables, values, errors, function_str
+        )
+        var_names = tuple(variables)
+
+        # 元の関数のPython形式を取得
+        results["original_function"] = str(_cached_sympify(function_str, var_names))
+
+        # 偏微分のPython形式を格納
+        partials = _cached_gradient(function_str, var_names)
+        results["derivatives"] = [
+            {'variable': var, 'expression': str(partial_derivative)}
+            for var, partial_derivative in zip(var_names, partials)
+        ]
+        return results
+
     @staticmethod
     def perform_ttest(group1: List[float], group2: List[float], test_type: str = "independent") -> Dict[str, float]:
         """2集団のt検定を実行する
@@ -168,33 +281,43 @@ class StatisticalAnalyzer:
             - mean2: 第2群の平均
             - test_type: 実行した検定の種類
         """
-        group1_array = np.array(group1)
-        group2_array = np.array(group2)
+        group1_array = np.asarray(group1, dtype=np.float64)
+        group2_array = np.asarray(group2, dtype=np.float64)
+        n1 = group1_array.size
+        n2 = group2_array.size
         
+        # 平均は一度だけ計算し、検定には要約統計量を渡す
         mean1 = np.mean(group1_array)
         mean2 = np.mean(group2_array)
         
         if test_type == "independent":
             # 独立2標本t検定（等分散を仮定）
-            statistic, pvalue = stats.ttest_ind(group1_array, group2_array)
-            dof = len(group1) + len(group2) - 2
+            statistic, pvalue = stats.ttest_ind_from_stats(
+                mean1, np.std(group1_array, ddof=1), n1,
+                mean2, np.std(group2_array, ddof=1), n2,
+                equal_var=True
+            )
+            dof = n1 + n2 - 2
         elif test_type == "paired":
             # 対応2標本t検定
-            if len(group1) != len(group2):
+            if n1 != n2:
                 raise ValueError("対応2標本t検定では、両群のデータ数が同じである必要があります")
-            statistic, pvalue = stats.ttest_rel(group1_array, group2_array)
-            dof = len(group1) - 1
+            dof = n1 - 1
+            # 差の平均は各群の平均の差に等しいので、差の標準偏差だけを計算する
+            std_diff = np.std(group1_array - group2_array, ddof=1)
+            statistic = (mean1 - mean2) / (std_diff / np.sqrt(n1))
+            pvalue = 2 * stats.t.sf(np.abs(statistic), dof)
         else:
             raise ValueError("test_typeは'independent'または'paired'である必要があります")
         
-        return {
-            "statistic": float(statistic),
-            "pvalue": float(pvalue),
-            "dof": int(dof),
-            "mean1": float(mean1),
-            "mean2": float(mean2),
+        return _as_python({
+            "statistic": statistic,
+            "pvalue": pvalue,
+            "dof": dof,
+            "mean1": mean1,
+            "mean2": mean2,
             "test_type": test_type
-        }
+        })
 
     @staticmethod
     def format_results(results: Dict[str, float], test_type: str) -> str:
@@ -0,0 +1,46 @@
+import numpy as np
+
+from src.analyzer import StatisticalAnalyzer
+
+
+def test_qtest_batch():
+    # 各行を独立に検定する（全データが同じ値の行はQ=0で外れ値なし）
+    batch = np.array([
+        [1.0, 1.1, 1.2, 5.0],
+        [2.0, 2.0, 2.0, 2.0],
+        [1.0, 2.0, 3.0, 4.0],
+    ])
+    results = StatisticalAnalyzer.perform_qtest(batch)
+    for row, q_stat, is_outlier in zip(batch, results["q_statistic"], results["is_outlier"]):
+        expected = StatisticalAnalyzer.perform_qtest(row)
+        assert q_stat == expected["q_statistic"]
+        assert is_outlier == expected["is_outlier"]
+    assert results["q_statistic"][1] == 0.0
+    assert results["is_outlier"].tolist() == [1, 0, 0]
+
+
+def test_confidence_interval_batch():
+    batch = np.array([
+        [9.8, 10.1, 10.0, 10.3],
+        [5.0, 5.0, 5.0, 5.0],
+    ])
+    results = StatisticalAnalyzer.calculate_confidence_interval(batch)
+    for i, row in enumerate(batch):
+        expected = StatisticalAnalyzer.calculate_confidence_interval(row)
+        for key in ("mean", "std", "lower", "upper"):
+            assert np.isclose(results[key][i], expected[key])
+    # 全データが同じ値の行は区間の幅が0
+    assert results["lower"][1] == results["upper"][1] == 5.0
+
+
+def test_one_dimensional_results_are_python_scalars():
+    qtest = StatisticalAnalyzer.perform_qtest([1.0, 1.1, 1.2, 5.0])
+    assert type(qtest["q_statistic"]) is float
+    assert type(qtest["q_critical"]) is float
+    assert type(qtest["is_outlier"]) is int
+
+    constant = StatisticalAnalyzer.perform_qtest([2.0, 2.0, 2.0])
+    assert constant == {"q_statistic": 0.0, "q_critical": 0.970, "is_outlier": 0}
+
+    interval = StatisticalAnalyzer.calculate_confidence_interval([9.8, 10.1, 10.0])
+    assert all(type(value) is float for value in interval.values())
@@ -1,3 +1,5 @@
+import pytest
+
 from src.analyzer import StatisticalAnalyzer
 
 def test_error_propagation():
@@ -19,5 +21,11 @@ def test_error_propagation():
     # 結果を表示
     print(analyzer.format_results(results, "error_propagation"))
 
+
+def test_error_propagation_outside_domain():
+    # 定義域外の値（負の数の平方根）はnanを返さずにValueErrorとする
+    with pytest.raises(ValueError):
+        StatisticalAnalyzer.calculate_error_propagation(['x'], [-2.0], [0.1], 'sqrt(x)')
+
 if __name__ == "__main__":
     test_error_propagation()
\ No newline at end of file
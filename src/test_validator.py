@@ -0,0 +1,37 @@
+import numpy as np
+
+from src.validator import DataValidator
+
+
+def test_validate_input_rejects_malformed_tokens():
+    # 数値の直後に不正な文字が続くトークンは、手前までの値で打ち切らずに無効とする
+    for text in ["5 1a", "1.5 2.5abc", "3 4 5x"]:
+        is_valid, numbers, error_msg = DataValidator.validate_input(text)
+        assert not is_valid
+        assert numbers is None
+        assert error_msg is not None
+
+
+def test_validate_input_matches_float():
+    # np.fromstringで扱えない書式もfloat()と同じ値に変換する
+    for text in ["1_000", "1.5 2.5 -3e2", "5. .5 +3", "inf -1", "1e400"]:
+        is_valid, numbers, error_msg = DataValidator.validate_input(text)
+        assert is_valid, error_msg
+        assert numbers.tolist() == [float(x) for x in text.split()]
+
+
+def test_validate_input_integer_inputs():
+    # 整数だけの入力もfloat()と同じ値に変換する（"-0"の符号も保つ）
+    is_valid, _, _ = DataValidator.validate_input("0x10")
+    assert not is_valid
+    for text in ["1_000 2", "12 -7 +3", "99999999999999999999 1", "-0 0"]:
+        is_valid, numbers, error_msg = DataValidator.validate_input(text)
+        assert is_valid, error_msg
+        np.testing.assert_array_equal(numbers, [float(x) for x in text.split()])
+        assert np.signbit(numbers).tolist() == [x.startswith("-") for x in text.split()]
+
+
+def test_validate_input_reports_offending_token():
+    _, _, error_msg = DataValidator.validate_input("5 1a 3")
+    assert "'1a'" in error_msg
+
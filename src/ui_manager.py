@@ -1,12 +1,34 @@
 import flet as ft
+import time
 from typing import Callable, Dict, List
-import pyperclip
+import numpy as np
 from .validator import DataValidator
-from .analyzer import StatisticalAnalyzer
+
+# 連続したペースト操作でクリップボードを再読み込みしない時間（秒）
+_CLIPBOARD_TTL = 0.1
+
+
+def _parse_csv_floats(text: str) -> np.ndarray:
+    """カンマ区切りの数値文字列をNumPy配列に変換する（不正な値はValueError）"""
+    # 入力欄は短いため、float()で1つずつ変換して"2a"のような不正な値を確実に検出する
+    # （区切り文字前後の空白はfloat()が無視するため、事前のstripは不要）
+    return np.fromiter(map(float, text.split(",")), dtype=np.float64)
+
 
 class UIManager:
     def __init__(self):
-        """UIコンポーネントの初期化"""
+        """UIマネージャーの初期化（UIコンポーネントはcreate_layoutで生成する）"""
+        # 重いモジュール（sympy/scipy）を読み込むStatisticalAnalyzerは初回計算時に生成する
+        self._analyzer = None
+        
+        # 現在フォーカスされているテキストフィールドを保持
+        self.focused_text_field = None
+
+        # 直前に読み込んだクリップボードの内容と時刻
+        self._clipboard_cache = None
+
+    def _create_controls(self) -> None:
+        """UIコンポーネントを生成する（create_layoutから呼ばれる）"""
         # 変数入力フィールド
         # 共通のテキストフィールドスタイル
         text_field_style = {
@@ -133,13 +155,6 @@ class UIManager:
             on_click=lambda _: self.handle_test_click("ttest")
         )
 
-        # UIコンポーネントの参照を保持
-        self._validator = DataValidator()
-        self._analyzer = StatisticalAnalyzer()
-        
-        # 現在フォーカスされているテキストフィールドを保持
-        self.focused_text_field = None
-
     def _on_text_field_focus(self, e):
         """テキストフィールドがフォーカスされた時の処理"""
         self.focused_text_field = e.control
@@ -153,11 +168,23 @@ class UIManager:
         elif (e.key == "c" and e.ctrl) or (e.key == "c" and e.meta):
             self._copy_to_clipboard()
 
+    def _read_clipboard(self) -> str:
+        """クリップボードの内容を読み込む（短時間の連続読み込みはキャッシュを返す）"""
+        now = time.monotonic()
+        if self._clipboard_cache is not None:
+            content, read_at = self._clipboard_cache
+            if now - read_at < _CLIPBOARD_TTL:
+                return content
+        import pyperclip
+        content = pyperclip.paste()
+        self._clipboard_cache = (content, now)
+        return content
+
     def _paste_from_clipboard(self):
         """クリップボードから内容をペーストする"""
         if self.focused_text_field:
             try:
-                clipboard_content = pyperclip.paste()
+                clipboard_content = self._read_clipboard()
                 if clipboard_content:
                     current_value = self.focused_text_field.value or ""
                     # カーソル位置が取得できない場合は末尾に追加
@@ -168,17 +195,29 @@ class UIManager:
 
     def _copy_to_clipboard(self):
         """選択されたテキストをクリップボードにコピーする"""
-        if self.focused_text_field and self.focused_text_field.value:
-            try:
-                # テキストフィールドの全内容をコピー（選択範囲の取得は困難なため）
-                pyperclip.copy(self.focused_text_field.value)
-            except Exception as e:
-                print(f"コピーエラー: {e}")
+        field = self.focused_text_field
+        if not (field and field.value):
+            return
+        try:
+            selection = getattr(field, "selection", None)
+            if selection is None:
+                # 選択範囲を取得できないFletのバージョンではテキストフィールドの全内容をコピー
+                import pyperclip
+                pyperclip.copy(field.value)
+            elif selection.start != selection.end:
+                start, end = sorted((selection.start, selection.end))
+                field.page.set_clipboard(field.value[start:end])
+            else:
+                return
+            # 直後のペーストで古い内容を返さないよう、読み込みキャッシュを破棄する
+            self._clipboard_cache = None
+        except Exception as e:
+            print(f"コピーエラー: {e}")
 
     def _paste_to_field(self, text_field: ft.TextField):
         """指定されたテキストフィールドにクリップボードの内容をペーストする"""
         try:
-            clipboard_content = pyperclip.paste()
+            clipboard_content = self._read_clipboard()
             if clipboard_content:
                 # 現在の値に追加するか、置き換えるかを選択（今回は置き換え）
                 text_field.value = clipboard_content
@@ -192,6 +231,8 @@ class UIManager:
         Returns:
             ft.Container: UIコンポーネントを含むコンテナ
         """
+        self._create_controls()
+
         # スタイル設定
         # Flet公式APIではButtonStyleのshape/side/bgcolorはサポートされていないため削除
         # ボタン色はElevatedButtonの引数で指定
@@ -406,6 +447,13 @@ class UIManager:
             padding=ft.padding.symmetric(horizontal=24, vertical=16)
         )
 
+    def _get_analyzer(self):
+        """StatisticalAnalyzerを初回使用時に読み込んで返す"""
+        if self._analyzer is None:
+            from .analyzer import StatisticalAnalyzer
+            self._analyzer = StatisticalAnalyzer()
+        return self._analyzer
+
     def handle_test_click(self, test_type: str) -> None:
         """統計テストの実行を処理する
 
@@ -416,12 +464,13 @@ class UIManager:
         self.clear_messages()
 
         try:
+            analyzer = self._get_analyzer()
             if test_type == "error_propagation":
                 # 誤差伝播計算の処理
                 try:
-                    variables = [x.strip() for x in self.variable_input.value.split(",")]
-                    values = [float(x.strip()) for x in self.value_input.value.split(",")]
-                    errors = [float(x.strip()) for x in self.error_input.value.split(",")]
+                    variables = list(map(str.strip, self.variable_input.value.split(",")))
+                    values = _parse_csv_floats(self.value_input.value)
+                    errors = _parse_csv_floats(self.error_input.value)
                     function_str = self.function_input.value.strip()
                 except ValueError:
                     self.show_error("数値の入力が不正です。値と誤差には数値を入力してください。")
@@ -435,7 +484,7 @@ class UIManager:
                     self.show_error(error_msg)
                     return
 
-                results = StatisticalAnalyzer.calculate_error_propagation(
+                results = analyzer.calculate_error_propagation(
                     variables, values, errors, function_str
                 )
             elif test_type == "ttest":
@@ -449,7 +498,7 @@ class UIManager:
 
                 # t検定の実行
                 test_type_value = self.ttest_type_dropdown.value
-                results = StatisticalAnalyzer.perform_ttest(group1, group2, test_type_value)
+                results = analyzer.perform_ttest(group1, group2, test_type_value)
             else:
                 # 基本統計処理の入力データの検証
                 is_valid, numbers, error_msg = DataValidator.validate_input(self.data_input.value)
@@ -469,12 +518,12 @@ class UIManager:
 
                 # 統計テストの実行
                 if test_type == "qtest":
-                    results = StatisticalAnalyzer.perform_qtest(numbers)
+                    results = analyzer.perform_qtest(numbers)
                 else:  # confidence_interval
-                    results = StatisticalAnalyzer.calculate_confidence_interval(numbers)
+                    results = analyzer.calculate_confidence_interval(numbers)
 
             # 結果の表示
-            formatted_result = StatisticalAnalyzer.format_results(results, test_type)
+            formatted_result = analyzer.format_results(results, test_type)
             self.show_result(formatted_result)
 
         except ValueError as ve:
@@ -1,165 +1,230 @@
-from typing import List, Tuple, Optional, Dict
+from functools import lru_cache
+from typing import FrozenSet, List, Tuple, Optional, Dict, Set, Union
 import numpy as np
 import re
+from keyword import iskeyword
+
+# 関数式中の識別子と括弧のパターン
+_TOKEN_RE = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*|[()]')
+
+# テスト種別ごとの最低データ数とエラーメッセージ
+# （誤差伝播の要件はvalidate_error_propagation_inputsで検証する）
+_TEST_RULES = {
+    "qtest": (3, "Qテストには最低3つのデータが必要です。"),
+    "ttest": (2, "t検定には最低2つのデータが必要です。"),
+    "confidence_interval": (1, "信頼区間の計算には最低1つのデータが必要です。"),
+    "error_propagation": (0, None),
+}
+
+
+@lru_cache(maxsize=128)
+def _var_set(variables: Tuple[str, ...]) -> Tuple[Optional[str], FrozenSet[str]]:
+    """変数名の形式（ASCIIの識別子で予約語でないこと）を検証し、変数名の集合を返す
+
+    同じ変数リストでの再検証ではキャッシュした結果を返す
+
+    Returns:
+        Tuple[Optional[str], FrozenSet[str]]:
+        - 最初に見つかった無効な変数名（すべて有効な場合はNone）
+        - 変数名の集合
+    """
+    # ループ内での属性参照を避けるため、判定に使う関数をローカル変数に束縛する
+    isascii, isidentifier, is_keyword = str.isascii, str.isidentifier, iskeyword
+    for var in variables:
+        if not (isascii(var) and isidentifier(var)) or is_keyword(var):
+            return var, frozenset()
+    return None, frozenset(variables)
+
+
+def _analyze_function(s: str, var_set: FrozenSet[str]) -> Tuple[Set[str], int, int]:
+    """関数式を1回走査し、未定義の識別子と括弧の深さを同時に求める
+
+    Returns:
+        Tuple[Set[str], int, int]:
+        - 未定義の識別子の集合
+        - 走査終了時の括弧の深さ
+        - 走査中の括弧の深さの最小値（負なら閉じ括弧が先行している）
+    """
+    undefined = set()
+    depth = min_depth = 0
+    for m in _TOKEN_RE.finditer(s):
+        token = m.group()
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+            if depth < min_depth:
+                min_depth = depth
+        elif token not in var_set:
+            undefined.add(token)
+    return undefined, depth, min_depth
+
+
+def validate_input(text: str) -> Tuple[bool, Optional[np.ndarray], Optional[str]]:
+    """テキスト入力を検証し、数値配列に変換する
+
+    Args:
+        text (str): 改行または空白で区切られた数値データ
+
+    Returns:
+        Tuple[bool, Optional[np.ndarray], Optional[str]]: 
+        - 検証結果（True/False）
+        - 変換された数値配列（検証失敗時はNone）
+        - エラーメッセージ（検証成功時はNone）
+    """
+    if not text:
+        return False, None, "データが入力されていません。"
+
+    # 改行とスペースで分割（空白のみの入力は空のリストになる）
+    values = text.split()
+    if not values:
+        return False, None, "データが入力されていません。"
+
+    try:
+        # 文字列を数値に変換（float()の書式をそのまま受け付け、要素数を指定して配列に直接詰める）
+        numbers = np.fromiter(map(float, values), np.float64, count=len(values))
+    except ValueError:
+        # 失敗した場合のみ、変換できなかった値を探して示す
+        for x in values:
+            try:
+                float(x)
+            except ValueError:
+                return False, None, f"無効な入力があります: '{x}'。数値のみを入力してください。"
+        raise
+
+    # 数値配列が空でないことを確認
+    if numbers.size == 0:
+        return False, None, "有効な数値が入力されていません。"
+
+    return True, numbers, None
+
+
+def check_data_requirements(data: Union[List[float], np.ndarray], test_type: str) -> Tuple[bool, Optional[str]]:
+    """統計テストの要件を満たしているか確認する
+
+    Args:
+        data (Union[List[float], np.ndarray]): 検証するデータ
+        test_type (str): テストの種類 ('qtest', 'confidence_interval', 'error_propagation')
+
+    Returns:
+        Tuple[bool, Optional[str]]:
+        - 検証結果（True/False）
+        - エラーメッセージ（検証成功時はNone）
+    """
+    rule = _TEST_RULES.get(test_type)
+    if rule is None:
+        return False, "不正なテスト種別です。"
+
+    min_size, error_msg = rule
+    if np.size(data) < min_size:
+        return False, error_msg
+    return True, None
+
+
+def validate_error_propagation_inputs(variables: List[str], values: List[float],
+                                      errors: List[float], function_str: str
+                                      ) -> Tuple[bool, Optional[str]]:
+    """誤差伝播計算の入力値を検証する
+
+    Args:
+        variables (List[str]): 変数名のリスト
+        values (List[float]): 変数の値のリスト
+        errors (List[float]): 誤差のリスト
+        function_str (str): 関数式
+
+    Returns:
+        Tuple[bool, Optional[str]]:
+        - 検証結果（True/False）
+        - エラーメッセージ（検証成功時はNone）
+    """
+    # 空の入力をチェック
+    if not variables or len(values) == 0 or len(errors) == 0 or not function_str:
+        return False, "すべての入力フィールドを入力してください。"
+
+    # リストの長さが一致することを確認
+    if not (len(variables) == len(values) == len(errors)):
+        return False, "変数名、値、誤差の数が一致していません。"
+
+    # 変数名の形式を検証し、変数名の集合を取得
+    invalid_var, var_set = _var_set(tuple(variables))
+    if invalid_var is not None:
+        return False, f"無効な変数名です: {invalid_var}"
+
+    # 誤差が正の値であることを確認（要素数が多い場合はNumPyで一括判定）
+    if len(errors) >= 16:
+        has_non_positive = (np.asarray(errors, dtype=np.float64) <= 0).any()
+    else:
+        has_non_positive = any(error <= 0 for error in errors)
+    if has_non_positive:
+        return False, "誤差は正の値である必要があります。"
+
+    # 関数式の識別子と括弧を1回の走査で解析する
+    undefined_vars, depth, min_depth = _analyze_function(function_str, var_set)
+
+    # 関数式に使用されている変数名を検証
+    if undefined_vars:
+        return False, f"関数式で未定義の変数が使用されています: {', '.join(undefined_vars)}"
+
+    # 基本的な関数式の構文を検証（括弧の対応、")(" のような閉じ括弧の先行）
+    if depth != 0 or min_depth < 0:
+        return False, "関数式の括弧の対応が正しくありません。"
+
+    return True, None
+
+
+def split_data_for_ttest(data: Union[List[float], np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """データをt検定用に2グループに分割する
+
+    Args:
+        data (Union[List[float], np.ndarray]): 分割するデータ
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 2つのグループに分けられたデータ
+        （元の配列とメモリを共有するビューのため、書き換えると元のデータも変わる）
+    """
+    arr = np.asarray(data)
+    mid = arr.size // 2
+    return arr[:mid], arr[mid:]
+
+
+def validate_ttest_inputs(group1_text: str, group2_text: str) -> Tuple[bool, Optional[np.ndarray], Optional[np.ndarray], Optional[str]]:
+    """t検定用の入力データを検証する
+
+    Args:
+        group1_text (str): 第1群のデータ（文字列）
+        group2_text (str): 第2群のデータ（文字列）
+
+    Returns:
+        Tuple[bool, Optional[np.ndarray], Optional[np.ndarray], Optional[str]]:
+        - 検証結果（True/False）
+        - 第1群の数値配列
+        - 第2群の数値配列
+        - エラーメッセージ（検証成功時はNone）
+    """
+    # 第1群のデータを検証
+    is_valid1, group1, error1 = validate_input(group1_text)
+    if not is_valid1:
+        return False, None, None, f"第1群のデータエラー: {error1}"
+    
+    # 第2群のデータを検証
+    is_valid2, group2, error2 = validate_input(group2_text)
+    if not is_valid2:
+        return False, None, None, f"第2群のデータエラー: {error2}"
+    
+    # 各群に最低2つのデータが必要
+    if len(group1) < 2:
+        return False, None, None, "第1群には最低2つのデータが必要です"
+    
+    if len(group2) < 2:
+        return False, None, None, "第2群には最低2つのデータが必要です"
+    
+    return True, group1, group2, None
+
 
 class DataValidator:
-    @staticmethod
-    def validate_input(text: str) -> Tuple[bool, Optional[List[float]], Optional[str]]:
-        """テキスト入力を検証し、数値リストに変換する
-
-        Args:
-            text (str): 改行または空白で区切られた数値データ
-
-        Returns:
-            Tuple[bool, Optional[List[float]], Optional[str]]: 
-            - 検証結果（True/False）
-            - 変換された数値リスト（検証失敗時はNone）
-            - エラーメッセージ（検証成功時はNone）
-        """
-        if not text or text.isspace():
-            return False, None, "データが入力されていません。"
-
-        # 改行とスペースで分割
-        values = text.split()
-        
-        try:
-            # 文字列を数値に変換
-            numbers = [float(x) for x in values]
-            
-            # 数値リストが空でないことを確認
-            if not numbers:
-                return False, None, "有効な数値が入力されていません。"
-                
-            return True, numbers, None
-            
-        except ValueError:
-            return False, None, "無効な入力があります。数値のみを入力してください。"
-
-    @staticmethod
-    def check_data_requirements(data: List[float], test_type: str) -> Tuple[bool, Optional[str]]:
-        """統計テストの要件を満たしているか確認する
-
-        Args:
-            data (List[float]): 検証するデータ
-            test_type (str): テストの種類 ('qtest', 'confidence_interval', 'error_propagation')
-
-        Returns:
-            Tuple[bool, Optional[str]]:
-            - 検証結果（True/False）
-            - エラーメッセージ（検証成功時はNone）
-        """
-        if test_type == "qtest":
-            # Qテストには最低3つのデータが必要
-            if len(data) < 3:
-                return False, "Qテストには最低3つのデータが必要です。"
-        elif test_type == "ttest":
-            # t検定には最低2つのデータが必要
-            if len(data) < 2:
-                return False, "t検定には最低2つのデータが必要です。"
-        elif test_type == "confidence_interval":
-            if len(data) < 1:
-                return False, "信頼区間の計算には最低1つのデータが必要です。"
-        elif test_type == "error_propagation":
-            pass  # 誤差伝播の要件は別メソッドで検証
-        else:
-            return False, "不正なテスト種別です。"
-
-        return True, None
-
-    @staticmethod
-    def validate_error_propagation_inputs(variables: List[str], values: List[float],
-                                        errors: List[float], function_str: str
-                                        ) -> Tuple[bool, Optional[str]]:
-        """誤差伝播計算の入力値を検証する
-
-        Args:
-            variables (List[str]): 変数名のリスト
-            values (List[float]): 変数の値のリスト
-            errors (List[float]): 誤差のリスト
-            function_str (str): 関数式
-
-        Returns:
-            Tuple[bool, Optional[str]]:
-            - 検証結果（True/False）
-            - エラーメッセージ（検証成功時はNone）
-        """
-        # 空の入力をチェック
-        if not variables or not values or not errors or not function_str:
-            return False, "すべての入力フィールドを入力してください。"
-
-        # リストの長さが一致することを確認
-        if not (len(variables) == len(values) == len(errors)):
-            return False, "変数名、値、誤差の数が一致していません。"
-
-        # 変数名の形式を検証
-        variable_pattern = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
-        for var in variables:
-            if not variable_pattern.match(var):
-                return False, f"無効な変数名です: {var}"
-
-        # 誤差が正の値であることを確認
-        if any(error <= 0 for error in errors):
-            return False, "誤差は正の値である必要があります。"
-
-        # 関数式に使用されている変数名を検証
-        function_vars = set(re.findall(r'[a-zA-Z_][a-zA-Z0-9_]*', function_str))
-        undefined_vars = function_vars - set(variables)
-        if undefined_vars:
-            return False, f"関数式で未定義の変数が使用されています: {', '.join(undefined_vars)}"
-
-        # 基本的な関数式の構文を検証
-        try:
-            # シンプルな構文チェック（括弧の対応など）
-            if function_str.count('(') != function_str.count(')'):
-                return False, "関数式の括弧の対応が正しくありません。"
-        except Exception as e:
-            return False, f"関数式の構文が不正です: {str(e)}"
-
-        return True, None
-
-    @staticmethod
-    def split_data_for_ttest(data: List[float]) -> Tuple[List[float], List[float]]:
-        """データをt検定用に2グループに分割する
-
-        Args:
-            data (List[float]): 分割するデータ
-
-        Returns:
-            Tuple[List[float], List[float]]: 2つのグループに分けられたデータ
-        """
-        mid = len(data) // 2
-        return data[:mid], data[mid:]
-
-    @staticmethod
-    def validate_ttest_inputs(group1_text: str, group2_text: str) -> Tuple[bool, Optional[List[float]], Optional[List[float]], Optional[str]]:
-        """t検定用の入力データを検証する
-
-        Args:
-            group1_text (str): 第1群のデータ（文字列）
-            group2_text (str): 第2群のデータ（文字列）
-
-        Returns:
-            Tuple[bool, Optional[List[float]], Optional[List[float]], Optional[str]]:
-            - 検証結果（True/False）
-            - 第1群の数値リスト
-            - 第2群の数値リスト
-            - エラーメッセージ（検証成功時はNone）
-        """
-        # 第1群のデータを検証
-        is_valid1, group1, error1 = DataValidator.validate_input(group1_text)
-        if not is_valid1:
-            return False, None, None, f"第1群のデータエラー: {error1}"
-        
-        # 第2群のデータを検証
-        is_valid2, group2, error2 = DataValidator.validate_input(group2_text)
-        if not is_valid2:
-            return False, None, None, f"第2群のデータエラー: {error2}"
-        
-        # 各群に最低2つのデータが必要
-        if len(group1) < 2:
-            return False, None, None, "第1群には最低2つのデータが必要です"
-        
-        if len(group2) < 2:
-            return False, None, None, "第2群には最低2つのデータが必要です"
-        
-        return True, group1, group2, None
\ No newline at end of file
+    # 既存の呼び出し側のためにモジュール関数を静的メソッドとして公開する
+    validate_input = staticmethod(validate_input)
+    check_data_requirements = staticmethod(check_data_requirements)
+    validate_error_propagation_inputs = staticmethod(validate_error_propagation_inputs)
+    split_data_for_ttest = staticmethod(split_data_for_ttest)
+    validate_ttest_inputs = staticmethod(validate_ttest_inputs)